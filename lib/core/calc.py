@@ -1,21 +1,120 @@
-import math
 import json
+import os
 from collections import namedtuple
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    import micropython
+    from micropython import const
+except ImportError:
+    def const(x):
+        return x
+
+    class micropython:
+        # The compiler only recognises the literal @micropython.native form
+        @staticmethod
+        def native(f):
+            return f
+
 CalibrationData = namedtuple('CalibrationData', ['temp_offset', 'humidity_offset'])
 
+# Index order used by SensorCalibrator.apply_calibration_index
+SENSOR_NAMES = ('innen', 'aussen')
+
+# Q16.16 fixed-point constants for the logarithm approximation
+_Q16_ONE = const(65536)
+_Q16_SQRT_HALF = const(46341)
+_Q16_LN2 = const(45426)
+_Q16_THIRD = const(21845)
+_Q16_FIFTH = const(13107)
+_Q16_TO_FLOAT = 1.0 / 65536
+_RH_TO_Q16 = 65536 / 100.0
+
+# Magnus formula coefficients
+_MAGNUS_A = 17.27
+_MAGNUS_B = 237.7
+_NAN = float('nan')
+
+_SAVE_DELAY_MS = const(2000)
+
+# Indexed by the number of thresholds the dew point distance exceeds
+_RISK = (
+    ('critical', 'KONDENSATION MÖGLICH!'),
+    ('critical', 'Hohes Kondensationsrisiko!'),
+    ('warning', 'Erhöhte Aufmerksamkeit'),
+    ('ok', 'Kein Kondensationsrisiko'),
+)
+
+# Parsed calibration files keyed by path: (stat key, data)
+_calibration_cache = {}
+
+
+def _in_running_task():
+    if asyncio is None:
+        return False
+    try:
+        return asyncio.current_task() is not None
+    except RuntimeError:
+        return False
+
+
+@micropython.native
+def _ln_q16(x):
+    """Natural logarithm of a Q16.16 value in (0, 1], result in Q16.16.
+
+    The argument is normalised to [sqrt(0.5), sqrt(2)) by left shifts and
+    ln(m) = 2 * atanh((m - 1) / (m + 1)) is evaluated as a short series.
+    All intermediates stay below 2**30 so MicroPython keeps them as small
+    integers.
+    """
+    k = 0
+    while x < _Q16_SQRT_HALF:
+        x <<= 1
+        k += 1
+    s = ((x - _Q16_ONE) << 15) // ((x + _Q16_ONE) >> 1)
+    s2 = (s * s) >> 16
+    p = _Q16_ONE + ((s2 * (_Q16_THIRD + ((s2 * _Q16_FIFTH) >> 16))) >> 16)
+    return ((s * p) >> 15) - k * _Q16_LN2
+
+
 class SensorCalibrator:
     """Manage calibration data for sensors."""
 
     def __init__(self, config_path='/sd/calibration.json'):
         self.config_path = config_path
         self.calibrations = {}
+        self._cals = ()
+        self._cache_key = None
+        self._save_pending = False
+        self._load_calibrations()
+
+    def _stat_key(self):
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (st[6], st[8])
+
+    def reload(self):
         self._load_calibrations()
 
     def _load_calibrations(self):
+        key = self._stat_key()
+        if key is not None and key == self._cache_key:
+            return
         try:
-            with open(self.config_path, 'r') as f:
-                data = json.load(f)
+            cached = _calibration_cache.get(self.config_path)
+            if key is not None and cached and cached[0] == key:
+                data = cached[1]
+            else:
+                with open(self.config_path, 'r') as f:
+                    data = json.load(f)
+                _calibration_cache[self.config_path] = (key, data)
+            self._cache_key = key
             for sensor, cal in data.items():
                 self.calibrations[sensor] = CalibrationData(
                     temp_offset=cal.get('temp_offset', 0.0),
@@ -26,6 +125,12 @@ class SensorCalibrator:
                 'innen': CalibrationData(0.0, 0.0),
                 'aussen': CalibrationData(0.0, 0.0)
             }
+        self._bind_offsets()
+
+    def _bind_offsets(self):
+        zero = CalibrationData(0.0, 0.0)
+        self._cals = tuple(self.calibrations.get(name, zero)
+                           for name in SENSOR_NAMES)
 
     def save_calibrations(self):
         data = {
@@ -35,11 +140,21 @@ class SensorCalibrator:
         }
         try:
             with open(self.config_path, 'w') as f:
-                json.dump(data, f)
+                f.write(json.dumps(data))
         except Exception as e:
             print('Calibration save error:', e)
+            return
+        self._cache_key = self._stat_key()
+        _calibration_cache[self.config_path] = (self._cache_key, data)
+
+    def apply_calibration_index(self, index, temp, humidity):
+        temp_offset, humidity_offset = self._cals[index]
+        return temp + temp_offset, max(0, min(100, humidity + humidity_offset))
 
     def apply_calibration(self, sensor_name, temp, humidity):
+        if sensor_name in SENSOR_NAMES:
+            return self.apply_calibration_index(
+                SENSOR_NAMES.index(sensor_name), temp, humidity)
         cal = self.calibrations.get(sensor_name, CalibrationData(0.0, 0.0))
         temp = temp + cal.temp_offset
         hum = max(0, min(100, humidity + cal.humidity_offset))
@@ -47,6 +162,22 @@ class SensorCalibrator:
 
     def set_calibration(self, sensor_name, temp_offset, humidity_offset):
         self.calibrations[sensor_name] = CalibrationData(temp_offset, humidity_offset)
+        self._bind_offsets()
+        self._schedule_save()
+
+    def _schedule_save(self):
+        # Only debounce inside a running task; from the REPL no loop would
+        # ever run the deferred save
+        if not _in_running_task():
+            self.save_calibrations()
+            return
+        if not self._save_pending:
+            self._save_pending = True
+            asyncio.create_task(self._deferred_save())
+
+    async def _deferred_save(self):
+        await asyncio.sleep_ms(_SAVE_DELAY_MS)
+        self._save_pending = False
         self.save_calibrations()
 
 
@@ -54,24 +185,18 @@ class TaupunktCalculator:
     """Utility for dew point calculations and risk evaluation."""
 
     @staticmethod
+    @micropython.native
     def calculate_dew_point(temp, humidity):
         if humidity <= 0 or humidity > 100:
-            return float('nan')
-        a = 17.27
-        b = 237.7
-        alpha = ((a * temp) / (b + temp)) + math.log(humidity / 100.0)
-        dew_point = (b * alpha) / (a - alpha)
-        return round(dew_point, 2)
+            return _NAN
+        ln_rh = _ln_q16(max(1, int(humidity * _RH_TO_Q16)))
+        alpha = (_MAGNUS_A * temp) / (_MAGNUS_B + temp) + ln_rh * _Q16_TO_FLOAT
+        return (_MAGNUS_B * alpha) / (_MAGNUS_A - alpha)
 
     @staticmethod
     def evaluate_condensation_risk(indoor_dp, outdoor_temp, threshold=2.0):
-        if math.isnan(indoor_dp) or math.isnan(outdoor_temp):
+        if indoor_dp != indoor_dp or outdoor_temp != outdoor_temp:
             return 'unknown', 'Sensor-Daten ungültig'
         diff = outdoor_temp - indoor_dp
-        if diff > threshold + 1.0:
-            return 'ok', 'Kein Kondensationsrisiko'
-        if diff > threshold:
-            return 'warning', 'Erhöhte Aufmerksamkeit'
-        if diff > 0:
-            return 'critical', 'Hohes Kondensationsrisiko!'
-        return 'critical', 'KONDENSATION MÖGLICH!'
+        idx = (diff > 0) + (diff > threshold) + (diff > threshold + 1.0)
+        return _RISK[idx]
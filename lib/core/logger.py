@@ -1,4 +1,5 @@
 import os
+import struct
 import time
 
 try:
@@ -11,15 +12,92 @@ except ImportError:
     SPI = None
     Pin = None
 
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    from micropython import const
+except ImportError:
+    def const(x):
+        return x
+
+_MB = const(1024 * 1024)
+_FLUSH_SIZE = const(512)
+_RING_SIZE = const(8192)
+_CSV_HEADER = (b'timestamp,temp_in,hum_in,dp_in,temp_out,hum_out,dp_out,'
+               b'temp_in_avg5,temp_out_avg5,status,trend_in,trend_out\n')
+_FMT = b"%d,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s\n"
+
+# Binary records: timestamp, eight values in hundredths and one byte with
+# status (bits 0-1), trend_in (bits 2-3) and trend_out (bits 4-5)
+_BIN_HEADER = b'TAU\x01'
+_BIN_FMT = '<IhhhhhhhhB'
+_BIN_NONE = const(-32768)
+_STATUS_CODES = {'ok': 0, 'warning': 1, 'critical': 2, 'unknown': 3}
+_TREND_CODES = {'stable': 0, 'rising': 1, 'falling': 2, 'initializing': 3}
+
+
+def _f2(x):
+    # Missing values become an empty field, NaN is written as 'nan'
+    if x is None:
+        return b''
+    if x != x:
+        return b'nan'
+    n = round(x * 100)
+    sign = b'-' if n < 0 else b''
+    n = abs(n)
+    return b"%s%d.%02d" % (sign, n // 100, n % 100)
+
+
+def _i2(x):
+    # NaN (e.g. a dew point at 0 %RH) is stored like a missing value
+    return _BIN_NONE if x is None or x != x else round(x * 100)
+
+
+class _MissingTrend:
+    # Stands in for the TrendData of a sensor that delivered no value
+    avg_5min = None
+    trend = ''
+
+
+_NO_TREND = _MissingTrend()
+
+
 class EnhancedDataLogger:
     """Simple rotating logger for SD cards."""
 
     def __init__(self, pins, params):
         self.params = params
-        self.last_log_time = 0
+        self.binary = params.get('binary_log', False)
+        self._ext = 'bin' if self.binary else 'csv'
+        self._log_path = "/sd/{}_current.{}".format(params['log_file_prefix'],
+                                                    self._ext)
+        self.last_log_ms = None
+        self.log_interval_ms = params['log_interval_sek'] * 1000
         self.is_mounted = False
-        self.max_file_size = params.get('max_log_file_mb', 5) * 1024 * 1024
+        self.max_file_size = params.get('max_log_file_mb', 5) * _MB
         self.max_files = params.get('max_log_files', 30)
+        self.current_file_size = 0
+        # Records are queued in a preallocated ring and written out in
+        # sector-sized chunks by drain_task
+        self._ring = bytearray(_RING_SIZE)
+        self._ring_mv = memoryview(self._ring)
+        self._head = 0
+        self._tail = 0
+        self._pending = 0
+        self._ready = asyncio.Event() if asyncio else None
+        self._fh = None
         self._init_sd_card(pins)
 
     def _init_sd_card(self, pins):
@@ -35,40 +113,166 @@ class EnhancedDataLogger:
             vfs = storage.VfsFat(sd)
             storage.mount(vfs, '/sd')
             self.is_mounted = True
-            self._write_header()
+            self._open_log_file()
         except Exception as e:
             print('SD-Karte Initialisierungsfehler:', e)
 
     def _get_current_log_file_path(self):
-        return f"/sd/{self.params['log_file_prefix']}_current.csv"
+        return self._log_path
+
+    def _open_log_file(self):
+        path = self._log_path
+        try:
+            self.current_file_size = os.stat(path)[6]
+        except OSError:
+            self.current_file_size = 0
+        self._fh = open(path, 'ab')
+        self._write_header()
 
     def _write_header(self):
-        if not self.is_mounted:
+        if not self.is_mounted or self.current_file_size:
             return
-        path = self._get_current_log_file_path()
+        header = _BIN_HEADER if self.binary else _CSV_HEADER
         try:
-            with open(path, 'a+') as f:
-                if f.tell() == 0:
-                    f.write('timestamp,temp_in,hum_in,dp_in,temp_out,hum_out,dp_out,'
-                            'temp_in_avg5,temp_out_avg5,status,trend_in,trend_out\n')
+            self._fh.write(header)
+            self.current_file_size = len(header)
         except Exception as e:
             print('Header-Schreibfehler:', e)
 
+    def _archive_path(self, index):
+        return f"/sd/{self.params['log_file_prefix']}_{index}.{self._ext}"
+
+    def _rotate_log_if_needed(self):
+        if self.current_file_size < self.max_file_size:
+            return
+        path = self._log_path
+        try:
+            self.current_file_size = os.stat(path)[6]
+            if self.current_file_size < self.max_file_size:
+                return
+            self._fh.close()
+            self._fh = None
+            keep = self.max_files - 1
+            if keep > 0:
+                try:
+                    os.remove(self._archive_path(keep))
+                except OSError:
+                    pass
+                for i in range(keep - 1, 0, -1):
+                    try:
+                        os.rename(self._archive_path(i),
+                                  self._archive_path(i + 1))
+                    except OSError:
+                        pass
+                os.rename(path, self._archive_path(1))
+            else:
+                os.remove(path)
+            self._open_log_file()
+        except Exception as e:
+            print('Log-Rotationsfehler:', e)
+            if self._fh is None:
+                try:
+                    self._open_log_file()
+                except Exception:
+                    pass
+
     async def log_data_async(self, data, trends):
         if not self.is_mounted:
             return
+        now = ticks_ms()
+        if (self.last_log_ms is not None
+                and ticks_diff(now, self.last_log_ms) < self.log_interval_ms):
+            return
+        self.last_log_ms = now
         current_time = time.time()
-        if current_time - self.last_log_time < self.params['log_interval_sek']:
+        t_in = trends.get('in', _NO_TREND)
+        t_out = trends.get('out', _NO_TREND)
+        if self.binary:
+            record = self._pack_record(current_time, data, t_in, t_out)
+        else:
+            record = _FMT % (current_time, _f2(data['t_in']),
+                             _f2(data['h_in']), _f2(data['dp_in']),
+                             _f2(data['t_out']), _f2(data['h_out']),
+                             _f2(data['dp_out']),
+                             _f2(t_in.avg_5min), _f2(t_out.avg_5min),
+                             data['status'].encode(), t_in.trend.encode(),
+                             t_out.trend.encode())
+        self._push(record)
+
+    def _pack_record(self, timestamp, data, t_in, t_out):
+        flags = (_STATUS_CODES.get(data['status'], 3)
+                 | _TREND_CODES.get(t_in.trend, 3) << 2
+                 | _TREND_CODES.get(t_out.trend, 3) << 4)
+        return struct.pack(_BIN_FMT, int(timestamp),
+                           _i2(data['t_in']), _i2(data['h_in']),
+                           _i2(data['dp_in']), _i2(data['t_out']),
+                           _i2(data['h_out']), _i2(data['dp_out']),
+                           _i2(t_in.avg_5min), _i2(t_out.avg_5min), flags)
+
+    def _push(self, record):
+        n = len(record)
+        if n > _RING_SIZE - self._pending:
+            print('Log-Puffer voll, Datensatz verworfen')
+            return
+        head = self._head
+        first = _RING_SIZE - head
+        if first >= n:
+            self._ring[head:head + n] = record
+        else:
+            mv = memoryview(record)
+            self._ring[head:] = mv[:first]
+            self._ring[:n - first] = mv[first:]
+        self._head = (head + n) % _RING_SIZE
+        self._pending += n
+        if self._ready is not None and self._pending >= _FLUSH_SIZE:
+            self._ready.set()
+
+    def _write_chunk(self, limit):
+        # Writes at most `limit` contiguous bytes from the ring
+        tail = self._tail
+        n = min(self._pending, _RING_SIZE - tail, limit)
+        try:
+            self._fh.write(self._ring_mv[tail:tail + n])
+            self.current_file_size += n
+        except Exception as e:
+            print('Logging-Fehler:', e)
+        self._tail = (tail + n) % _RING_SIZE
+        self._pending -= n
+
+    def _write_buffer(self):
+        if not self._pending or self._fh is None:
             return
-        path = self._get_current_log_file_path()
-        line = (f"{current_time},{data['t_in']:.2f},{data['h_in']:.2f},"
-                f"{data['dp_in']:.2f},{data['t_out']:.2f},{data['h_out']:.2f},"
-                f"{data['dp_out']:.2f},{trends['in'].avg_5min:.2f},"
-                f"{trends['out'].avg_5min:.2f},{data['status']},"
-                f"{trends['in'].trend},{trends['out'].trend}\n")
+        while self._pending:
+            self._write_chunk(_RING_SIZE)
         try:
-            with open(path, 'a') as f:
-                f.write(line)
-            self.last_log_time = current_time
+            self._fh.flush()
         except Exception as e:
             print('Logging-Fehler:', e)
+        self._rotate_log_if_needed()
+
+    async def drain_task(self):
+        """Write queued records one sector at a time, yielding in between."""
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._pending >= _FLUSH_SIZE and self._fh is not None:
+                self._write_chunk(_FLUSH_SIZE)
+                await asyncio.sleep(0)
+            if self._fh is not None:
+                try:
+                    self._fh.flush()
+                except Exception as e:
+                    print('Logging-Fehler:', e)
+                self._rotate_log_if_needed()
+
+    async def flush(self):
+        self._write_buffer()
+
+    def close(self):
+        self._write_buffer()
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
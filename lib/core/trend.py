@@ -1,4 +1,13 @@
-from collections import deque, namedtuple
+from collections import namedtuple
+
+try:
+    from micropython import const
+except ImportError:
+    def const(x):
+        return x
+
+_WINDOW_SHORT_SEK = const(300)
+_WINDOW_LONG_SEK = const(900)
 
 TrendData = namedtuple('TrendData', ['current', 'avg_5min', 'avg_15min', 'trend'])
 
@@ -7,16 +16,38 @@ class RingBuffer:
 
     def __init__(self, size):
         self.size = size
-        self.data = deque((), size)
+        self.data = [0.0] * size
+        self._count = 0
+        self._idx = 0
+        self._sum = 0.0
 
     def add(self, value):
-        self.data.append(value)
+        idx = self._idx
+        if self._count < self.size:
+            self._sum += value
+            self._count += 1
+        else:
+            self._sum += value - self.data[idx]
+        self.data[idx] = value
+        self._idx = (idx + 1) % self.size
+
+    def __len__(self):
+        return self._count
+
+    def sum_last(self, n):
+        n = min(n, self._count)
+        idx = self._idx
+        total = 0.0
+        for _ in range(n):
+            idx = idx - 1 if idx else self.size - 1
+            total += self.data[idx]
+        return total
 
     def average(self):
-        return sum(self.data) / len(self.data) if self.data else 0.0
+        return self._sum / self._count if self._count else 0.0
 
     def is_full(self):
-        return len(self.data) == self.size
+        return self._count == self.size
 
 
 class TrendAnalyzer:
@@ -24,31 +55,39 @@ class TrendAnalyzer:
 
     def __init__(self, measurement_interval=900):
         self.measurement_interval = measurement_interval
+        self.window_5min = max(1, _WINDOW_SHORT_SEK // measurement_interval)
+        size = max(self.window_5min,
+                   _WINDOW_LONG_SEK // measurement_interval)
         self.buffers = {
-            'innen': {
-                '5min': RingBuffer(max(1, 300 // measurement_interval)),
-                '15min': RingBuffer(max(1, 900 // measurement_interval)),
-            },
-            'aussen': {
-                '5min': RingBuffer(max(1, 300 // measurement_interval)),
-                '15min': RingBuffer(max(1, 900 // measurement_interval)),
-            }
+            'innen': RingBuffer(size),
+            'aussen': RingBuffer(size)
         }
 
     def add_measurement(self, sensor_name, value):
         if sensor_name in self.buffers:
-            for buf in self.buffers[sensor_name].values():
-                buf.add(value)
+            self.buffers[sensor_name].add(value)
 
     def get_trend_data(self, sensor_name, current_value):
-        if sensor_name not in self.buffers:
+        buf = self.buffers.get(sensor_name)
+        if buf is None:
             return TrendData(current_value, current_value, current_value, 'stable')
+        return self._trend(buf, current_value)
+
+    def add_and_get(self, sensor_name, value):
+        """Add a measurement and return its TrendData in one call."""
+        buf = self.buffers.get(sensor_name)
+        if buf is None:
+            return TrendData(value, value, value, 'stable')
+        buf.add(value)
+        return self._trend(buf, value)
 
-        buffers = self.buffers[sensor_name]
-        avg5 = buffers['5min'].average()
-        avg15 = buffers['15min'].average()
+    def _trend(self, buf, current_value):
+        count = len(buf)
+        window = self.window_5min
+        avg5 = buf.sum_last(window) / min(window, count) if count else 0.0
+        avg15 = buf.average()
 
-        if not buffers['5min'].is_full():
+        if count < window:
             trend = 'initializing'
         elif current_value > avg5 + 0.5:
             trend = 'rising'
@@ -1,5 +1,28 @@
 import time
+import micropython
 import uasyncio as asyncio
+from micropython import const
+
+# Raw values are 20 bit: 100 * 100 / 2**20 == 625 / 2**16 and
+# 200 * 100 / 2**20 == 625 / 2**15, so hundredths come from a shift.
+_CENTI = 0.01
+_AHT_INIT = b'\xBE\x08\x00'
+_AHT_TRIG = b'\xAC\x33\x00'
+# Poll the busy bit instead of always waiting the 80 ms worst case
+_POLL_MS = const(5)
+_MAX_WAIT_MS = const(80)
+_READ_INTERVAL_MS = const(1000)
+
+
+@micropython.viper
+def _decode(buf: ptr8) -> int:  # noqa: F821
+    # Returns (centi-C << 16) | centi-%RH; fits a small int
+    hum_raw = int((buf[1] << 12) | (buf[2] << 4) | (buf[3] >> 4))
+    temp_raw = int(((buf[3] & 0x0F) << 16) | (buf[4] << 8) | buf[5])
+    hum = (hum_raw * 625) >> 16
+    temp = ((temp_raw * 625) >> 15) - 5000
+    return (temp << 16) | hum
+
 
 class AsyncSensorAHT20:
     """Asynchronous driver for the AHT20 sensor."""
@@ -7,26 +30,47 @@ class AsyncSensorAHT20:
     def __init__(self, i2c, addr=0x38):
         self.i2c = i2c
         self.addr = addr
-        self.last_read_time = 0
-        self.min_read_interval = 1.0
+        self.last_read_ms = time.ticks_ms()
+        self.min_read_interval_ms = _READ_INTERVAL_MS
+        self._rx = bytearray(7)
+        self._status = memoryview(self._rx)[:1]
         try:
-            self.i2c.writeto(self.addr, b'\xBE\x08\x00')
+            self.i2c.writeto(self.addr, _AHT_INIT)
         except Exception:
             pass
 
+    def start_measurement(self):
+        self.i2c.writeto(self.addr, _AHT_TRIG)
+
+    def result_ready(self):
+        self.i2c.readfrom_into(self.addr, self._status)
+        return not self._rx[0] & 0x80
+
+    def read_result(self):
+        self.i2c.readfrom_into(self.addr, self._rx)
+        v = _decode(self._rx)
+        return (v >> 16) * _CENTI, (v & 0xFFFF) * _CENTI
+
     async def read_async(self):
-        current_time = time.time()
-        if current_time - self.last_read_time < self.min_read_interval:
-            await asyncio.sleep_ms(100)
+        wait = self.min_read_interval_ms - time.ticks_diff(time.ticks_ms(),
+                                                           self.last_read_ms)
+        if wait > 0:
+            await asyncio.sleep_ms(wait)
+        else:
+            await asyncio.sleep(0)
+        # Failed reads count too, so the ticks difference stays far below
+        # the wrap-around range even while a sensor is unplugged
+        self.last_read_ms = time.ticks_ms()
         try:
-            self.i2c.writeto(self.addr, b'\xAC\x33\x00')
-            await asyncio.sleep_ms(80)
-            data = self.i2c.readfrom(self.addr, 7)
-            hum_raw = (((data[1] << 16) | (data[2] << 8) | data[3]) >> 4)
-            humidity = hum_raw * 100 / 1048576
-            temp_raw = (((data[3] & 0x0F) << 16) | (data[4] << 8) | data[5])
-            temp = temp_raw * 200 / 1048576 - 50
-            self.last_read_time = current_time
+            self.start_measurement()
+            await asyncio.sleep_ms(_POLL_MS)
+            for _ in range(_MAX_WAIT_MS // _POLL_MS):
+                if self.result_ready():
+                    break
+                await asyncio.sleep_ms(_POLL_MS)
+            else:
+                raise OSError('Messung nicht bereit')
+            temp, humidity = self.read_result()
             return temp, humidity
         except Exception as e:
             print('AHT20 Lesefehler:', e)
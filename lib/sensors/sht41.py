@@ -1,5 +1,30 @@
 import time
+import micropython
 import uasyncio as asyncio
+from micropython import const
+
+_CENTI = 0.01
+_SHT_TRIG = b'\xFD'
+# The sensor NACKs reads until the measurement is done (max 8.2 ms)
+_POLL_MS = const(2)
+_MAX_WAIT_MS = const(10)
+_READ_INTERVAL_MS = const(1000)
+
+
+@micropython.viper
+def _decode(buf: ptr8) -> int:  # noqa: F821
+    # Returns (centi-C << 16) | centi-%RH; 100 * 175 / 65535 is
+    # approximated by 17500 / 2**16 to avoid a division.
+    t_raw = int((buf[0] << 8) | buf[1])
+    h_raw = int((buf[3] << 8) | buf[4])
+    temp = ((17500 * t_raw) >> 16) - 4500
+    hum = ((12500 * h_raw) >> 16) - 600
+    if hum < 0:
+        hum = 0
+    if hum > 10000:
+        hum = 10000
+    return (temp << 16) | hum
+
 
 class AsyncSensorSHT41:
     """Asynchronous driver for the SHT41 sensor."""
@@ -7,23 +32,41 @@ class AsyncSensorSHT41:
     def __init__(self, i2c, addr=0x44):
         self.i2c = i2c
         self.addr = addr
-        self.last_read_time = 0
-        self.min_read_interval = 1.0
+        self.last_read_ms = time.ticks_ms()
+        self.min_read_interval_ms = _READ_INTERVAL_MS
+        self._rx = bytearray(6)
+
+    def start_measurement(self):
+        self.i2c.writeto(self.addr, _SHT_TRIG)
+
+    def read_result(self):
+        # Raises OSError (NACK) while the conversion is still running
+        self.i2c.readfrom_into(self.addr, self._rx)
+        v = _decode(self._rx)
+        return (v >> 16) * _CENTI, (v & 0xFFFF) * _CENTI
 
     async def read_async(self):
-        current_time = time.time()
-        if current_time - self.last_read_time < self.min_read_interval:
-            await asyncio.sleep_ms(100)
+        wait = self.min_read_interval_ms - time.ticks_diff(time.ticks_ms(),
+                                                           self.last_read_ms)
+        if wait > 0:
+            await asyncio.sleep_ms(wait)
+        else:
+            await asyncio.sleep(0)
+        # Failed reads count too, so the ticks difference stays far below
+        # the wrap-around range even while a sensor is unplugged
+        self.last_read_ms = time.ticks_ms()
         try:
-            self.i2c.writeto(self.addr, b'\xFD')
-            await asyncio.sleep_ms(10)
-            data = self.i2c.readfrom(self.addr, 6)
-            temp_raw = (data[0] << 8) | data[1]
-            temp = -45 + 175 * temp_raw / 65535.0
-            hum_raw = (data[3] << 8) | data[4]
-            humidity = -6 + 125 * hum_raw / 65535.0
-            humidity = max(0, min(100, humidity))
-            self.last_read_time = current_time
+            self.start_measurement()
+            waited = 0
+            while True:
+                await asyncio.sleep_ms(_POLL_MS)
+                waited += _POLL_MS
+                try:
+                    temp, humidity = self.read_result()
+                    break
+                except OSError:
+                    if waited >= _MAX_WAIT_MS:
+                        raise
             return temp, humidity
         except Exception as e:
             print('SHT41 Lesefehler:', e)
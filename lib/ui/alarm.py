@@ -5,6 +5,15 @@ except ImportError:
     Pin = None
     PWM = None
 import uasyncio as asyncio
+from micropython import const
+
+_DUTY_FULL = const(32768)
+_DUTY_HALF = const(16384)
+_FREQ_CONDENSATION = const(1500)
+_FREQ_SENSOR_FAILURE = const(2500)
+_FREQ_GENERIC = const(2000)
+_PATTERN_MS = const(500)
+
 
 class AlarmController:
     """Handle buzzer alarms."""
@@ -13,6 +22,9 @@ class AlarmController:
         self.is_alarm_active = False
         self.alarm_type = None
         self.alarm_start_time = 0
+        self._last_freq = 0
+        self._last_duty = 0
+        self._evt = asyncio.Event()
         if buzzer_pin is not None and PWM:
             self.buzzer = PWM(Pin(buzzer_pin))
             self.buzzer.duty_u16(0)
@@ -32,37 +44,43 @@ class AlarmController:
             self._play_sensor_failure_alarm()
         else:
             self._play_generic_alarm()
+        self._evt.set()
 
     def stop_alarm(self):
         self.is_alarm_active = False
         self.alarm_type = None
-        if self.buzzer:
-            self.buzzer.duty_u16(0)
+        self._set(self._last_freq, 0)
+        self._evt.clear()
         print('Alarm gestoppt')
 
+    def _set(self, freq, duty):
+        if not self.buzzer:
+            return
+        if freq != self._last_freq:
+            self.buzzer.freq(freq)
+            self._last_freq = freq
+        if duty != self._last_duty:
+            self.buzzer.duty_u16(duty)
+            self._last_duty = duty
+
     def _play_condensation_alarm(self):
-        if self.buzzer:
-            self.buzzer.freq(1500)
-            self.buzzer.duty_u16(32768)
+        self._set(_FREQ_CONDENSATION, _DUTY_FULL)
 
     def _play_sensor_failure_alarm(self):
-        if self.buzzer:
-            self.buzzer.freq(2500)
-            self.buzzer.duty_u16(16384)
+        self._set(_FREQ_SENSOR_FAILURE, _DUTY_HALF)
 
     def _play_generic_alarm(self):
-        if self.buzzer:
-            self.buzzer.freq(2000)
-            self.buzzer.duty_u16(32768)
+        self._set(_FREQ_GENERIC, _DUTY_FULL)
 
     async def alarm_pattern_task(self):
         while True:
-            if self.is_alarm_active and self.alarm_type == 'sensor_failure':
-                if self.buzzer:
-                    self.buzzer.duty_u16(32768)
-                await asyncio.sleep_ms(500)
-                if self.buzzer:
-                    self.buzzer.duty_u16(0)
-                await asyncio.sleep_ms(500)
-            else:
-                await asyncio.sleep_ms(100)
+            await self._evt.wait()
+            while self.is_alarm_active and self.alarm_type == 'sensor_failure':
+                self._set(self._last_freq, _DUTY_FULL)
+                await asyncio.sleep_ms(_PATTERN_MS)
+                if self.alarm_type != 'sensor_failure':
+                    break
+                self._set(self._last_freq, 0)
+                await asyncio.sleep_ms(_PATTERN_MS)
+            # Continuous alarms need no pattern; sleep until the next trigger
+            self._evt.clear()
@@ -0,0 +1,35 @@
+import time
+try:
+    from machine import Pin
+except ImportError:
+    Pin = None
+import uasyncio as asyncio
+from micropython import const
+
+_DEBOUNCE_MS = const(200)
+
+
+class ButtonEvent:
+    """Awaitable falling-edge event for a push button.
+
+    The IRQ handler only gates contact bounce on the tick counter and sets
+    a ThreadSafeFlag (a pollable object the scheduler waits on), so it
+    allocates nothing and all reactions to the press run in normal task
+    context.
+    """
+
+    def __init__(self, pin):
+        self.pin = pin
+        self._flag = asyncio.ThreadSafeFlag()
+        self._last_ms = time.ticks_add(time.ticks_ms(), -_DEBOUNCE_MS)
+        pin.irq(trigger=Pin.IRQ_FALLING, handler=self._set, hard=True)
+
+    def _set(self, _):
+        t = time.ticks_ms()
+        if time.ticks_diff(t, self._last_ms) < _DEBOUNCE_MS:
+            return
+        self._last_ms = t
+        self._flag.set()
+
+    async def wait(self):
+        await self._flag.wait()
@@ -7,6 +7,69 @@ except ImportError:
     font_medium = None
     Pin = None
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    asyncio = None
+
+_fmt1 = "{:.1f}".format
+
+
+def _r1(x):
+    return None if x is None else round(x, 1)
+
+
+_LABEL_X = 10
+_HEADINGS = (
+    ('TAUPUNKT-KONTROLLE', 10, 0xFFFF),
+    ('INNEN:', 40, 0x07E0),
+    ('AUSSEN:', 140, 0x001F),
+)
+# key, label, unit, y, color
+_VALUE_ROWS = (
+    ('t_in', 'Temp: ', 'C', 60, 0xFFFF),
+    ('h_in', 'Feuchte: ', '%', 80, 0xFFFF),
+    ('dp_in', 'Taupunkt: ', 'C', 100, 0xFFE0),
+    ('t_out', 'Temp: ', 'C', 160, 0xFFFF),
+    ('h_out', 'Feuchte: ', '%', 180, 0xFFFF),
+    ('dp_out', 'Taupunkt: ', 'C', 200, 0xFFE0),
+)
+
+
+def render_text(font, text, fg, bg=0x0000):
+    """Rasterise text with a bitmap font into a big-endian RGB565 buffer.
+
+    Returns (buf, width, height) ready for ``tft.blit_buffer``.
+    """
+    fw = font.WIDTH
+    fh = font.HEIGHT
+    row_bytes = (fw + 7) // 8
+    glyph_bytes = row_bytes * fh
+    bitmap = font.FONT
+    first = font.FIRST
+    width = fw * len(text)
+    fg_hi, fg_lo = fg >> 8, fg & 0xFF
+    bg_hi, bg_lo = bg >> 8, bg & 0xFF
+    buf = bytearray(width * fh * 2)
+    if bg:
+        for i in range(0, len(buf), 2):
+            buf[i] = bg_hi
+            buf[i + 1] = bg_lo
+    stride = width * 2
+    for n, ch in enumerate(text):
+        base = (ord(ch) - first) * glyph_bytes
+        x0 = n * fw * 2
+        for row in range(fh):
+            off = row * stride + x0
+            src = base + row * row_bytes
+            for col in range(fw):
+                if bitmap[src + (col >> 3)] & (0x80 >> (col & 7)):
+                    pos = off + col * 2
+                    buf[pos] = fg_hi
+                    buf[pos + 1] = fg_lo
+    return buf, width, fh
+
+
 class DisplayController:
     """Control an ST7789 display."""
 
@@ -14,6 +77,8 @@ class DisplayController:
         self.width = width
         self.height = height
         self.is_on = True
+        self._last_frame = {}
+        self._last_data = None
         try:
             if st7789:
                 self.tft = st7789.ST7789(
@@ -27,6 +92,7 @@ class DisplayController:
                     rotation=1
                 )
                 self.font = font_medium
+                self._prepare_labels()
                 self.tft.init()
                 self.set_backlight(True)
             else:
@@ -35,6 +101,26 @@ class DisplayController:
             print('Display-Initialisierungsfehler:', e)
             self.tft = None
 
+    def _prepare_labels(self):
+        # Static labels are rasterised once and blitted after each clear;
+        # only the values still go through tft.text
+        rendered = {}
+        blits = []
+        for text, y, color in _HEADINGS + tuple(
+                (label, y, color) for _, label, _, y, color in _VALUE_ROWS):
+            text = text.rstrip()
+            item = rendered.get((text, color))
+            if item is None:
+                item = render_text(self.font, text, color)
+                rendered[(text, color)] = item
+            buf, w, h = item
+            blits.append((buf, _LABEL_X, y, w, h))
+        self._label_blits = tuple(blits)
+        fw = self.font.WIDTH
+        self._value_rows = tuple(
+            (key, unit, _LABEL_X + len(label) * fw, y, color)
+            for key, label, unit, y, color in _VALUE_ROWS)
+
     def set_backlight(self, state):
         if self.tft:
             try:
@@ -46,34 +132,80 @@ class DisplayController:
     def clear_screen(self, color=0x0000):
         if self.tft:
             self.tft.fill(color)
+            self._last_frame = {}
+            self._last_data = None
+
+    def _draw_line(self, key, line, x, y, color):
+        frame = self._last_frame
+        prev = frame.get(key)
+        if prev is not None and prev[0] == line and prev[1] == color:
+            return
+        # Pad with blanks so a shorter text erases the previous one
+        pad = len(prev[0]) - len(line) if prev is not None else 0
+        self.tft.text(self.font, line + ' ' * pad if pad > 0 else line,
+                      x, y, color, 0x0000)
+        frame[key] = (line, color)
+
+    def _new_frame(self, data):
+        # Returns the frame key to store after drawing, None if nothing to do
+        if not self.tft or not self.is_on:
+            return None
+        get = data.get
+        # Compare at display resolution; raw floats almost never repeat
+        frame = (_r1(get('t_in')), _r1(get('h_in')), _r1(get('dp_in')),
+                 _r1(get('t_out')), _r1(get('h_out')), _r1(get('dp_out')),
+                 get('status'), get('risk_level'))
+        if frame == self._last_data:
+            return None
+        return frame
+
+    def _render_main(self, data):
+        # Generator: yields after each SPI burst so callers can interleave
+        get = data.get
+        if not self._last_frame:
+            self.clear_screen(0x0000)
+            yield
+            blit = self.tft.blit_buffer
+            for buf, x, y, w, h in self._label_blits:
+                blit(buf, x, y, w, h)
+            yield
+        draw = self._draw_line
+        for key, unit, x, y, color in self._value_rows:
+            draw(key, _fmt1(get(key) or 0.0) + unit, x, y, color)
+            yield
+        status = get('status', 'unknown')
+        color = self._get_status_color(status)
+        draw('status', 'Status: ' + status, _LABEL_X, 240, color)
+        yield
+        draw('risk', 'Risiko: ' + get('risk_level', 'unknown'),
+             _LABEL_X, 260, color)
 
     def show_main_screen(self, data, trends):
-        if not self.tft:
+        frame = self._new_frame(data)
+        if frame is None:
             return
         try:
-            self.clear_screen(0x0000)
-            self.tft.text(self.font, 'TAUPUNKT-KONTROLLE', 10, 10, 0xFFFF, 0x0000)
-            y = 40
-            self.tft.text(self.font, 'INNEN:', 10, y, 0x07E0, 0x0000)
-            self.tft.text(self.font, f"Temp: {data.get('t_in', 0):.1f}C", 10, y+20, 0xFFFF, 0x0000)
-            self.tft.text(self.font, f"Feuchte: {data.get('h_in', 0):.1f}%", 10, y+40, 0xFFFF, 0x0000)
-            self.tft.text(self.font, f"Taupunkt: {data.get('dp_in', 0):.1f}C", 10, y+60, 0xFFE0, 0x0000)
-            y = 140
-            self.tft.text(self.font, 'AUSSEN:', 10, y, 0x001F, 0x0000)
-            self.tft.text(self.font, f"Temp: {data.get('t_out', 0):.1f}C", 10, y+20, 0xFFFF, 0x0000)
-            self.tft.text(self.font, f"Feuchte: {data.get('h_out', 0):.1f}%", 10, y+40, 0xFFFF, 0x0000)
-            self.tft.text(self.font, f"Taupunkt: {data.get('dp_out', 0):.1f}C", 10, y+60, 0xFFE0, 0x0000)
-            y = 240
-            status = data.get('status', 'unknown')
-            risk = data.get('risk_level', 'unknown')
-            color = self._get_status_color(status)
-            self.tft.text(self.font, f'Status: {status}', 10, y, color, 0x0000)
-            self.tft.text(self.font, f'Risiko: {risk}', 10, y+20, color, 0x0000)
+            for _ in self._render_main(data):
+                pass
+            # Stored after drawing: a full redraw clears the cached key
+            self._last_data = frame
+        except Exception as e:
+            print('Display-Update-Fehler:', e)
+
+    async def show_main_screen_async(self, data, trends):
+        """Like show_main_screen, but yields to the scheduler between lines."""
+        frame = self._new_frame(data)
+        if frame is None:
+            return
+        try:
+            for _ in self._render_main(data):
+                await asyncio.sleep(0)
+            self._last_data = frame
         except Exception as e:
             print('Display-Update-Fehler:', e)
 
     def show_alarm_screen(self, alarm_type, message):
-        if not self.tft:
+        if not self.tft or not self.is_on:
             return
         try:
             self.clear_screen(0xF800)
@@ -5,61 +5,103 @@ import time
 import gc
 import uasyncio as asyncio
 from machine import Pin, I2C, SPI, WDT
+from micropython import const
 
-from lib.core.calc import TaupunktCalculator, SensorCalibrator
+from lib.core.calc import TaupunktCalculator, SensorCalibrator, SENSOR_NAMES
 from lib.core.trend import TrendAnalyzer
 from lib.core.logger import EnhancedDataLogger
 from lib.ui.display import DisplayController
 from lib.ui.alarm import AlarmController
+from lib.ui.button import ButtonEvent
 from lib.sensors.sht41 import AsyncSensorSHT41
 from lib.sensors.aht20 import AsyncSensorAHT20
 
+_ADDR_SHT41 = const(0x44)
+_ADDR_AHT20 = const(0x38)
+_GC_INTERVAL_SEK = const(300)
+_ERROR_RETRY_MS = const(10000)
+_ERR_RING_SIZE = const(8)
+# 62.5 MHz is clk_peri / 2 at the default 125 MHz system clock
+_SPI_BAUDRATE = const(62_500_000)
+_LOC_KEYS = (
+    ('innen', ('t_in', 'h_in', 'dp_in')),
+    ('aussen', ('t_out', 'h_out', 'dp_out')),
+)
+
+_DEFAULT_CONFIG = {
+    'pins': {
+        'i2c_bus_id': 0, 'i2c_sda': 0, 'i2c_scl': 1,
+        'spi_bus_id': 1, 'spi_sck': 10, 'spi_mosi': 11,
+        'lcd_cs': 9, 'lcd_dc': 8, 'lcd_rst': 12, 'lcd_bl': 13,
+        'led_rot': 15, 'led_gelb': 14, 'led_gruen': 16,
+        'wakeup_button': 22, 'buzzer': 28,
+        'sd_spi_id': 0, 'sd_sck': 6, 'sd_mosi': 7, 'sd_miso': 4, 'sd_cs': 5
+    },
+    'params': {
+        'mess_intervall_sek': 900, 'log_interval_sek': 3600,
+        'log_file_prefix': 'taupunkt_log', 'max_log_file_mb': 5,
+        'max_log_files': 30, 'taupunkt_grenze_c': 2.0,
+        'alarm_taupunkt_abstand_c': 1.5, 'watchdog_timeout_ms': 8000,
+        'display_timeout_sek': 60, 'log_flush_sek': 3600,
+        'binary_log': False, 'spi_baudrate': _SPI_BAUDRATE
+    }
+}
+
+# Parsed config.json, read once per boot
+_CONFIG_CACHE = None
+# (rot, gelb, gruen) per risk level
+_LED_WARN = (0, 1, 0)
+_LED_PATTERNS = {'ok': (0, 0, 1), 'warning': _LED_WARN,
+                 'critical': (1, 0, 0), 'unknown': _LED_WARN}
+
+
 class EnhancedTaupunktController:
     def __init__(self):
         self.config = self._load_config()
         self.params = self.config['params']
         self.pins = self.config['pins']
+        self._mess_interval_sek = self.params['mess_intervall_sek']
+        self._display_timeout_ms = self.params['display_timeout_sek'] * 1000
+        self._dp_grenze = self.params['taupunkt_grenze_c']
         self._init_hardware()
         self.calibrator = SensorCalibrator()
-        self.trend_analyzer = TrendAnalyzer(self.params['mess_intervall_sek'])
+        self.trend_analyzer = TrendAnalyzer(self._mess_interval_sek)
         self.logger = EnhancedDataLogger(self.pins, self.params)
         self.is_display_on = True
-        self.last_user_activity = time.time()
+        self.last_user_activity = time.ticks_ms()
         self.system_status = 'initializing'
+        self._gc_counter = 0
+        self._gc_every = max(1, _GC_INTERVAL_SEK // self._mess_interval_sek)
+        # Last loop errors as (ticks_ms, repr) instead of printing each one
+        self._err_ring = [None] * _ERR_RING_SIZE
+        self._err_idx = 0
+        self.error_count = 0
 
     def _load_config(self):
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except Exception:
-            return self._get_default_config()
+        global _CONFIG_CACHE
+        if _CONFIG_CACHE is None:
+            try:
+                with open('config.json', 'r') as f:
+                    _CONFIG_CACHE = json.load(f)
+            except Exception:
+                _CONFIG_CACHE = self._get_default_config()
+        return _CONFIG_CACHE
 
     def _get_default_config(self):
-        return {
-            'pins': {
-                'i2c_bus_id': 0, 'i2c_sda': 0, 'i2c_scl': 1,
-                'spi_bus_id': 1, 'spi_sck': 10, 'spi_mosi': 11,
-                'lcd_cs': 9, 'lcd_dc': 8, 'lcd_rst': 12, 'lcd_bl': 13,
-                'led_rot': 15, 'led_gelb': 14, 'led_gruen': 16,
-                'wakeup_button': 22, 'buzzer': 28,
-                'sd_spi_id': 0, 'sd_sck': 6, 'sd_mosi': 7, 'sd_miso': 4, 'sd_cs': 5
-            },
-            'params': {
-                'mess_intervall_sek': 900, 'log_interval_sek': 3600,
-                'log_file_prefix': 'taupunkt_log', 'max_log_file_mb': 5,
-                'max_log_files': 30, 'taupunkt_grenze_c': 2.0,
-                'alarm_taupunkt_abstand_c': 1.5, 'watchdog_timeout_ms': 8000,
-                'display_timeout_sek': 60
-            }
-        }
+        return _DEFAULT_CONFIG
 
     def _init_hardware(self):
-        self.wdt = WDT(timeout=self.params['watchdog_timeout_ms'])
+        wdt_timeout = self.params['watchdog_timeout_ms']
+        self.wdt = WDT(timeout=wdt_timeout)
+        self._wdt_slice_ms = wdt_timeout // 2
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
         self.i2c = I2C(self.pins['i2c_bus_id'],
                        scl=Pin(self.pins['i2c_scl']),
                        sda=Pin(self.pins['i2c_sda']))
+        # rp2 clamps an unreachable rate to the nearest achievable one
+        # instead of raising, so there is no fallback path here
         self.spi = SPI(self.pins['spi_bus_id'],
-                       baudrate=30_000_000,
+                       baudrate=self.params.get('spi_baudrate', _SPI_BAUDRATE),
                        sck=Pin(self.pins['spi_sck']),
                        mosi=Pin(self.pins['spi_mosi']))
         self.leds = {
@@ -67,24 +109,42 @@ class EnhancedTaupunktController:
             'gelb': Pin(self.pins['led_gelb'], Pin.OUT),
             'gruen': Pin(self.pins['led_gruen'], Pin.OUT)
         }
+        self._all_leds = (self.leds['rot'], self.leds['gelb'],
+                          self.leds['gruen'])
+        for led in self._all_leds:
+            led.off()
+        self._led_pattern = None
         self.display = DisplayController(self.spi, self.pins, 172, 320)
         self.alarm = AlarmController(self.pins.get('buzzer'))
+        self._button_event = None
         wake = self.pins.get('wakeup_button')
         if wake:
             self.wakeup_button = Pin(wake, Pin.IN, Pin.PULL_UP)
-            self.wakeup_button.irq(trigger=Pin.IRQ_FALLING, handler=self._handle_wakeup)
+            self._button_event = ButtonEvent(self.wakeup_button)
         self._init_sensors()
 
     def _init_sensors(self):
         self.sensors = {}
         devices = self.i2c.scan()
-        if 0x44 in devices:
-            self.sensors['innen'] = AsyncSensorSHT41(self.i2c, 0x44)
-        if 0x38 in devices:
-            self.sensors['aussen'] = AsyncSensorAHT20(self.i2c, 0x38)
+        if _ADDR_SHT41 in devices:
+            self.sensors['innen'] = AsyncSensorSHT41(self.i2c, _ADDR_SHT41)
+        if _ADDR_AHT20 in devices:
+            self.sensors['aussen'] = AsyncSensorAHT20(self.i2c, _ADDR_AHT20)
+        self._sensor_scratch = {
+            name: {'temp': None, 'humidity': None, 'valid': False}
+            for name in SENSOR_NAMES}
+        self._processed = {}
+        self._sensor_list = tuple((idx, name, self.sensors[name])
+                                  for idx, name in enumerate(SENSOR_NAMES)
+                                  if name in self.sensors)
 
-    def _handle_wakeup(self, pin):
-        self.last_user_activity = time.time()
+    async def _wakeup_task(self):
+        while True:
+            await self._button_event.wait()
+            self._handle_wakeup()
+
+    def _handle_wakeup(self):
+        self.last_user_activity = time.ticks_ms()
         if not self.is_display_on:
             self.display.set_backlight(True)
             self.is_display_on = True
@@ -93,57 +153,113 @@ class EnhancedTaupunktController:
 
     async def control_loop(self):
         self.system_status = 'running'
+        wdt_feed = self.wdt.feed
+        interval_ms = self._mess_interval_sek * 1000
+        deadline = time.ticks_ms()
         while True:
             try:
-                self.wdt.feed()
+                wdt_feed()
+                now = time.ticks_ms()
                 sensor_data = await self._read_all_sensors()
                 processed = self._process_sensor_data(sensor_data)
                 trends = self._update_trends(processed)
                 risk = self._evaluate_risks(processed)
-                data = {**processed, **risk}
+                data = processed
+                data.update(risk)
                 self._update_led_status(risk['risk_level'])
                 if self.is_display_on:
-                    self.display.show_main_screen(data, trends)
+                    await self.display.show_main_screen_async(data, trends)
                 await self._check_alarms(data)
-                self._check_display_timeout()
-                await self.logger.log_data_async(data, trends)
-                if time.time() % 300 < 1:
+                self._check_display_timeout(now)
+                try:
+                    await self.logger.log_data_async(data, trends)
+                except Exception as e:
+                    # A bad record must not abort measurement and alarms
+                    self._record_error(e)
+                self._gc_counter += 1
+                if self._gc_counter >= self._gc_every:
                     gc.collect()
-                await asyncio.sleep(self.params['mess_intervall_sek'])
+                    self._gc_counter = 0
+                # Deadline-based so processing time does not add up as drift
+                deadline = time.ticks_add(deadline, interval_ms)
             except Exception as e:
-                print('Fehler in Hauptschleife:', e)
+                self._record_error(e)
                 self.system_status = 'error'
-                await asyncio.sleep(10)
+                deadline = time.ticks_add(time.ticks_ms(), _ERROR_RETRY_MS)
+            now = time.ticks_ms()
+            if time.ticks_diff(deadline, now) <= 0:
+                # Overran the interval: run again now instead of catching up
+                deadline = now
+                await asyncio.sleep(0)
+            else:
+                await self._sleep_until(deadline)
+
+    def _record_error(self, e):
+        self._err_ring[self._err_idx] = (time.ticks_ms(), repr(e))
+        self._err_idx = (self._err_idx + 1) % _ERR_RING_SIZE
+        self.error_count += 1
+
+    def recent_errors(self, n=_ERR_RING_SIZE):
+        """Return up to n recorded loop errors, newest first."""
+        ring = self._err_ring
+        out = []
+        for i in range(1, min(n, _ERR_RING_SIZE) + 1):
+            entry = ring[(self._err_idx - i) % _ERR_RING_SIZE]
+            if entry is None:
+                break
+            out.append(entry)
+        return out
+
+    async def _sleep_until(self, deadline):
+        # Sleep in slices shorter than the watchdog timeout and feed it
+        wdt_feed = self.wdt.feed
+        sleep_ms = asyncio.sleep_ms
+        step = self._wdt_slice_ms
+        while True:
+            dt = time.ticks_diff(deadline, time.ticks_ms())
+            if dt <= 0:
+                return
+            wdt_feed()
+            await sleep_ms(dt if dt < step else step)
 
     async def _read_all_sensors(self):
-        result = {}
-        for name, sensor in self.sensors.items():
-            try:
-                temp, hum = await sensor.read_async()
-                if temp is not None and hum is not None:
-                    t_cal, h_cal = self.calibrator.apply_calibration(name, temp, hum)
-                    result[name] = {'temp': t_cal, 'humidity': h_cal, 'valid': True}
-                else:
-                    result[name] = {'temp': None, 'humidity': None, 'valid': False}
-            except Exception as e:
-                print('Sensor', name, 'Lesefehler:', e)
-                result[name] = {'temp': None, 'humidity': None, 'valid': False}
+        # Returns the shared scratch dict; it is overwritten every cycle
+        result = self._sensor_scratch
+        sensors = self._sensor_list
+        # Both conversions run concurrently; each I2C transfer is a single
+        # blocking call, so transfers on the shared bus cannot interleave.
+        readings = await asyncio.gather(
+            *[s.read_async() for _, _, s in sensors], return_exceptions=True)
+        for (idx, name, _), reading in zip(sensors, readings):
+            if isinstance(reading, Exception):
+                print('Sensor', name, 'Lesefehler:', reading)
+                reading = (None, None)
+            temp, hum = reading
+            entry = result[name]
+            if temp is not None and hum is not None:
+                t_cal, h_cal = self.calibrator.apply_calibration_index(
+                    idx, temp, hum)
+                entry['temp'] = t_cal
+                entry['humidity'] = h_cal
+                entry['valid'] = True
+            else:
+                entry['temp'] = None
+                entry['humidity'] = None
+                entry['valid'] = False
         return result
 
     def _process_sensor_data(self, sensor_data):
-        processed = {}
-        calc = TaupunktCalculator()
-        for loc in ['innen', 'aussen']:
-            key_t = f't_{loc[:2]}'
-            key_h = f'h_{loc[:2]}'
-            key_dp = f'dp_{loc[:2]}'
-            if loc in sensor_data and sensor_data[loc]['valid']:
-                t = sensor_data[loc]['temp']
-                h = sensor_data[loc]['humidity']
-                dp = calc.calculate_dew_point(t, h)
+        # Fills the shared dict in place, like _read_all_sensors
+        processed = self._processed
+        dew_point = TaupunktCalculator.calculate_dew_point
+        for loc, (key_t, key_h, key_dp) in _LOC_KEYS:
+            sd = sensor_data.get(loc)
+            if sd and sd['valid']:
+                t = sd['temp']
+                h = sd['humidity']
                 processed[key_t] = t
                 processed[key_h] = h
-                processed[key_dp] = dp
+                processed[key_dp] = dew_point(t, h)
             else:
                 processed[key_t] = None
                 processed[key_h] = None
@@ -152,58 +268,83 @@ class EnhancedTaupunktController:
 
     def _update_trends(self, data):
         trends = {}
-        if data.get('t_in') is not None:
-            self.trend_analyzer.add_measurement('innen', data['t_in'])
-            trends['in'] = self.trend_analyzer.get_trend_data('innen', data['t_in'])
-        if data.get('t_out') is not None:
-            self.trend_analyzer.add_measurement('aussen', data['t_out'])
-            trends['out'] = self.trend_analyzer.get_trend_data('aussen', data['t_out'])
+        add_and_get = self.trend_analyzer.add_and_get
+        t_in = data['t_in']
+        if t_in is not None:
+            trends['in'] = add_and_get('innen', t_in)
+        t_out = data['t_out']
+        if t_out is not None:
+            trends['out'] = add_and_get('aussen', t_out)
         return trends
 
     def _evaluate_risks(self, data):
-        calc = TaupunktCalculator()
         dp_in = data.get('dp_in')
         t_out = data.get('t_out')
         if dp_in is not None and t_out is not None:
-            level, msg = calc.evaluate_condensation_risk(dp_in, t_out, self.params['taupunkt_grenze_c'])
+            level, msg = TaupunktCalculator.evaluate_condensation_risk(
+                dp_in, t_out, self._dp_grenze)
         else:
             level, msg = 'unknown', 'Sensordaten unvollständig'
         return {'risk_level': level, 'risk_message': msg, 'status': level}
 
     def _update_led_status(self, risk_level):
-        for led in self.leds.values():
-            led.off()
-        led_map = {'ok': 'gruen', 'warning': 'gelb', 'critical': 'rot', 'unknown': 'gelb'}
-        name = led_map.get(risk_level, 'gelb')
-        if name in self.leds:
-            self.leds[name].on()
+        pattern = _LED_PATTERNS.get(risk_level, _LED_WARN)
+        if pattern is self._led_pattern:
+            return
+        r, y, g = self._all_leds
+        pr, py, pg = pattern
+        r.value(pr)
+        y.value(py)
+        g.value(pg)
+        self._led_pattern = pattern
 
     async def _check_alarms(self, data):
         level = data.get('risk_level', 'unknown')
         if level == 'critical' and not self.alarm.is_alarm_active:
             self.alarm.trigger_alarm('condensation', data.get('risk_message', ''))
-            if self.display:
+            if self.is_display_on:
                 self.display.show_alarm_screen('KONDENSATION', data.get('risk_message', ''))
         if data.get('t_in') is None or data.get('t_out') is None:
             if not self.alarm.is_alarm_active or self.alarm.alarm_type != 'sensor_failure':
                 self.alarm.trigger_alarm('sensor_failure', 'Sensor-Ausfall erkannt')
 
-    def _check_display_timeout(self):
-        if (self.is_display_on and time.time() - self.last_user_activity > self.params['display_timeout_sek']):
+    def _check_display_timeout(self, now):
+        if (self.is_display_on
+                and time.ticks_diff(now, self.last_user_activity)
+                > self._display_timeout_ms):
             self.display.set_backlight(False)
             self.is_display_on = False
 
+    async def _log_flush_task(self):
+        # Never hold more than one log interval of records in RAM, so a
+        # power loss or watchdog reset costs at most one record
+        interval = min(self.params.get('log_flush_sek', 3600),
+                       self.params['log_interval_sek'])
+        while True:
+            await asyncio.sleep(interval)
+            await self.logger.flush()
+
     async def run_system(self):
         if self.display:
             self.display.clear_screen()
             self.display.show_main_screen({'status': 'initializing'}, {})
         tasks = [
             asyncio.create_task(self.control_loop()),
-            asyncio.create_task(self.alarm.alarm_pattern_task())
+            asyncio.create_task(self.alarm.alarm_pattern_task()),
+            asyncio.create_task(self.logger.drain_task()),
+            asyncio.create_task(self._log_flush_task())
         ]
+        if self._button_event:
+            tasks.append(asyncio.create_task(self._wakeup_task()))
         try:
             await asyncio.gather(*tasks)
         finally:
+            # gather does not cancel the siblings of a failed task; stop them
+            # before the buzzer is silenced so none can switch it back on
+            for task in tasks:
+                task.cancel()
+            await asyncio.sleep_ms(0)
+            self.logger.close()
             self.alarm.stop_alarm()
             if self.display:
                 self.display.set_backlight(False)
@@ -9,6 +9,15 @@ def test_dew_point_value():
     assert 9.0 < dp < 10.0
 
 
+def test_dew_point_matches_magnus_reference():
+    for temp in (-20.0, 0.0, 12.5, 25.0, 40.0):
+        for hum in (5.0, 30.0, 55.5, 80.0, 100.0):
+            alpha = (17.27 * temp) / (237.7 + temp) + math.log(hum / 100.0)
+            expected = (237.7 * alpha) / (17.27 - alpha)
+            dp = TaupunktCalculator.calculate_dew_point(temp, hum)
+            assert dp == pytest.approx(expected, abs=0.02)
+
+
 def test_invalid_humidity():
     assert math.isnan(TaupunktCalculator.calculate_dew_point(25.0, 0))
     assert math.isnan(TaupunktCalculator.calculate_dew_point(25.0, 150))
@@ -22,3 +31,7 @@ def test_condensation_risk_levels():
     assert level == 'warning'
     level, _ = calc.evaluate_condensation_risk(10.0, 11.0, 2.0)
     assert level == 'critical'
+    level, msg = calc.evaluate_condensation_risk(10.0, 9.5, 2.0)
+    assert (level, msg) == ('critical', 'KONDENSATION MÖGLICH!')
+    level, _ = calc.evaluate_condensation_risk(float('nan'), 9.5, 2.0)
+    assert level == 'unknown'
@@ -1,5 +1,6 @@
 import pytest
 import os
+import asyncio
 import json
 from lib.core.calc import SensorCalibrator
 
@@ -22,3 +23,61 @@ def test_set_and_save_calibration(tmp_path):
         saved = json.load(f)
     assert saved["innen"]["temp_offset"] == 0.5
     assert saved["innen"]["humidity_offset"] == 1.0
+    temp, hum = calib.apply_calibration_index(0, 20.0, 99.5)
+    assert temp == pytest.approx(20.5)
+    assert hum == pytest.approx(100.0)
+
+
+def test_reload_uses_cache_when_file_unchanged(tmp_path, monkeypatch):
+    cal_file = tmp_path / "cal.json"
+    data = {"aussen": {"temp_offset": -0.5, "humidity_offset": 3.0}}
+    cal_file.write_text(json.dumps(data))
+    SensorCalibrator(config_path=str(cal_file))
+
+    def fail_load(f):
+        raise AssertionError("calibration file parsed again")
+
+    monkeypatch.setattr("lib.core.calc.json.load", fail_load)
+    calib = SensorCalibrator(config_path=str(cal_file))
+    calib.reload()
+    temp, hum = calib.apply_calibration("aussen", 10.0, 50.0)
+    assert temp == pytest.approx(9.5)
+    assert hum == pytest.approx(53.0)
+
+
+class _AsyncioShim:
+    # CPython stand-in for the uasyncio calls used by SensorCalibrator
+    current_task = staticmethod(asyncio.current_task)
+    create_task = staticmethod(asyncio.create_task)
+
+    @staticmethod
+    async def sleep_ms(ms):
+        await asyncio.sleep(0)
+
+
+def test_saves_immediately_without_running_task(tmp_path, monkeypatch):
+    monkeypatch.setattr("lib.core.calc.asyncio", _AsyncioShim)
+    cal_file = tmp_path / "cal.json"
+    calib = SensorCalibrator(config_path=str(cal_file))
+    calib.set_calibration("innen", 0.5, 1.0)
+    assert json.loads(cal_file.read_text())["innen"]["temp_offset"] == 0.5
+
+
+def test_saves_are_debounced_inside_a_task(tmp_path, monkeypatch):
+    monkeypatch.setattr("lib.core.calc.asyncio", _AsyncioShim)
+    cal_file = tmp_path / "cal.json"
+    calib = SensorCalibrator(config_path=str(cal_file))
+    writes = []
+    save = calib.save_calibrations
+    monkeypatch.setattr(calib, "save_calibrations",
+                        lambda: writes.append(save()))
+
+    async def run():
+        calib.set_calibration("innen", 0.1, 0.0)
+        calib.set_calibration("innen", 0.2, 0.0)
+        assert not cal_file.exists()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert len(writes) == 1
+    assert json.loads(cal_file.read_text())["innen"]["temp_offset"] == 0.2
@@ -0,0 +1,65 @@
+from lib.ui.display import DisplayController, render_text
+
+
+class _Font:
+    WIDTH = 8
+    HEIGHT = 2
+    FIRST = 0x41
+    # 'A': top row left pixel, bottom row right pixel; 'B': full top row
+    FONT = bytes([0x80, 0x01, 0xFF, 0x00])
+
+
+def test_render_text_expands_bits_to_rgb565():
+    buf, w, h = render_text(_Font, 'AB', 0xF800)
+    assert (w, h) == (16, 2)
+    assert len(buf) == w * h * 2
+    assert buf[0:2] == b'\xF8\x00'
+    assert buf[2:4] == b'\x00\x00'
+    assert buf[16:32] == b'\xF8\x00' * 8
+    bottom = w * 2
+    assert buf[bottom + 14:bottom + 16] == b'\xF8\x00'
+    assert buf[bottom + 16:bottom + 32] == bytes(16)
+
+
+def test_render_text_fills_background():
+    buf, _, _ = render_text(_Font, 'A', 0xFFFF, 0x001F)
+    assert buf[0:2] == b'\xFF\xFF'
+    assert buf[2:4] == b'\x00\x1F'
+
+
+class _BlankFont:
+    WIDTH = 8
+    HEIGHT = 2
+    FIRST = 0x20
+    FONT = bytes(2 * 96)
+
+
+class _FakeTFT:
+    def __init__(self):
+        self.calls = 0
+
+    def fill(self, color):
+        self.calls += 1
+
+    def text(self, *args):
+        self.calls += 1
+
+    def blit_buffer(self, *args):
+        self.calls += 1
+
+
+def test_identical_frame_after_full_redraw_is_skipped():
+    display = DisplayController(None, {}, 172, 320)
+    display.tft = _FakeTFT()
+    display.font = _BlankFont
+    display._prepare_labels()
+    data = {'t_in': 21.04, 'h_in': 45.0, 'dp_in': 8.7, 't_out': 3.0,
+            'h_out': 80.0, 'dp_out': 0.1, 'status': 'ok', 'risk_level': 'ok'}
+    renders = []
+    render = display._render_main
+    display._render_main = lambda d: renders.append(d) or render(d)
+    display.show_main_screen(data, {})
+    assert display.tft.calls
+    # Same values at display resolution: no second render pass
+    display.show_main_screen(dict(data, t_in=20.96), {})
+    assert len(renders) == 1
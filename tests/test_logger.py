@@ -0,0 +1,99 @@
+import asyncio
+import io
+import struct
+
+from lib.core.logger import EnhancedDataLogger
+from lib.core.trend import TrendData
+
+PARAMS = {'log_file_prefix': 'test', 'log_interval_sek': 0}
+
+
+def _make_logger():
+    logger = EnhancedDataLogger({}, PARAMS)
+    logger.is_mounted = True
+    logger._fh = io.BytesIO()
+    return logger
+
+
+def test_log_line_format():
+    logger = _make_logger()
+    fh = logger._fh
+    data = {'t_in': 21.456, 'h_in': 48.0, 'dp_in': 9.9, 't_out': -3.25,
+            'h_out': 80.1, 'dp_out': -0.004, 'status': 'ok'}
+    trends = {'in': TrendData(21.456, 21.0, 21.0, 'stable'),
+              'out': TrendData(-3.25, -2.5, -2.5, 'falling')}
+    asyncio.run(logger.log_data_async(data, trends))
+    asyncio.run(logger.flush())
+    line = fh.getvalue().decode()
+    fields = line.rstrip('\n').split(',')
+    assert fields[1:] == ['21.46', '48.00', '9.90', '-3.25', '80.10',
+                          '0.00', '21.00', '-2.50', 'ok', 'stable',
+                          'falling']
+
+
+def test_log_line_writes_nan_dew_point():
+    logger = _make_logger()
+    fh = logger._fh
+    data = {'t_in': 20.0, 'h_in': 0.0, 'dp_in': float('nan'), 't_out': 5.0,
+            'h_out': 60.0, 'dp_out': -2.1, 'status': 'ok'}
+    trends = {'in': TrendData(20.0, 20.0, 20.0, 'stable'),
+              'out': TrendData(5.0, 5.0, 5.0, 'stable')}
+    asyncio.run(logger.log_data_async(data, trends))
+    asyncio.run(logger.flush())
+    fields = fh.getvalue().decode().rstrip('\n').split(',')
+    assert fields[2:4] == ['0.00', 'nan']
+
+
+def test_log_line_leaves_missing_sensor_empty():
+    logger = _make_logger()
+    fh = logger._fh
+    data = {'t_in': 20.0, 'h_in': 50.0, 'dp_in': 9.26, 't_out': None,
+            'h_out': None, 'dp_out': None, 'status': 'unknown'}
+    trends = {'in': TrendData(20.0, 20.0, 20.0, 'stable')}
+    asyncio.run(logger.log_data_async(data, trends))
+    asyncio.run(logger.flush())
+    fields = fh.getvalue().decode().rstrip('\n').split(',')
+    assert fields[4:] == ['', '', '', '20.00', '', 'unknown', 'stable', '']
+
+
+def test_binary_record_layout():
+    logger = EnhancedDataLogger({}, dict(PARAMS, binary_log=True))
+    logger.is_mounted = True
+    fh = logger._fh = io.BytesIO()
+    data = {'t_in': 21.5, 'h_in': 48.0, 'dp_in': 10.01, 't_out': 4.0,
+            'h_out': 0.0, 'dp_out': float('nan'), 'status': 'warning'}
+    trends = {'in': TrendData(21.5, 21.0, 21.0, 'rising'),
+              'out': TrendData(None, -2.5, -2.5, 'initializing')}
+    asyncio.run(logger.log_data_async(data, trends))
+    asyncio.run(logger.flush())
+    record = struct.unpack('<IhhhhhhhhB', fh.getvalue())
+    assert record[1:] == (2150, 4800, 1001, 400, 0, -32768,
+                          2100, -250, 1 | 1 << 2 | 3 << 4)
+
+
+def test_binary_record_marks_missing_sensor():
+    logger = EnhancedDataLogger({}, dict(PARAMS, binary_log=True))
+    logger.is_mounted = True
+    fh = logger._fh = io.BytesIO()
+    data = {'t_in': None, 'h_in': None, 'dp_in': None, 't_out': 4.0,
+            'h_out': 60.0, 'dp_out': -3.0, 'status': 'unknown'}
+    trends = {'out': TrendData(4.0, 4.0, 4.0, 'stable')}
+    asyncio.run(logger.log_data_async(data, trends))
+    asyncio.run(logger.flush())
+    record = struct.unpack('<IhhhhhhhhB', fh.getvalue())
+    assert record[1:] == (-32768, -32768, -32768, 400, 6000, -300,
+                          -32768, 400, 3 | 3 << 2 | 0 << 4)
+
+
+def test_ring_buffer_wraps_in_order():
+    logger = _make_logger()
+    fh = logger._fh
+    # 400-byte records with a flush every ~4 KB wrap the 8 KB ring
+    records = [b'%04d' % i * 100 for i in range(30)]
+    for rec in records:
+        logger._push(rec)
+        if logger._pending > 4000:
+            asyncio.run(logger.flush())
+    asyncio.run(logger.flush())
+    assert fh.getvalue() == b''.join(records)
+    assert logger._head != 0
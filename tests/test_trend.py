@@ -1,4 +1,6 @@
-from lib.core.trend import TrendAnalyzer
+import pytest
+
+from lib.core.trend import RingBuffer, TrendAnalyzer
 
 
 def test_trend_computation():
@@ -9,3 +11,31 @@ def test_trend_computation():
     assert data.trend == 'rising'
     assert data.current == 24
     assert data.avg_5min > 20
+
+
+def test_ring_buffer_running_average():
+    buf = RingBuffer(3)
+    assert buf.average() == 0.0
+    for value in (1.0, 2.0, 3.0, 4.0, 5.0):
+        buf.add(value)
+    assert buf.is_full()
+    assert buf.average() == pytest.approx(4.0)
+
+
+def test_short_window_uses_latest_values():
+    analyzer = TrendAnalyzer(measurement_interval=60)
+    for i in range(20):
+        analyzer.add_measurement('aussen', float(i))
+    data = analyzer.get_trend_data('aussen', 19.0)
+    assert data.avg_5min == pytest.approx(17.0)
+    assert data.avg_15min == pytest.approx(12.0)
+    assert data.trend == 'rising'
+
+
+def test_add_and_get_matches_separate_calls():
+    combined = TrendAnalyzer(measurement_interval=60)
+    separate = TrendAnalyzer(measurement_interval=60)
+    for value in (20.0, 20.5, 21.0, 22.0, 23.5, 23.0):
+        separate.add_measurement('innen', value)
+        assert combined.add_and_get('innen', value) == \
+            separate.get_trend_data('innen', value)